@@ -22,10 +22,9 @@ from __future__ import division
 from __future__ import print_function
 
 import functools
-import inspect
+import sys
 
 import numpy as np
-import six
 
 from tensorflow.python.autograph.utils import py_func
 from tensorflow.python.autograph.utils import tensors
@@ -45,6 +44,8 @@ from tensorflow.python.ops import gen_string_ops
 from tensorflow.python.ops import list_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import sort_ops
+from tensorflow.python.types import core
+from tensorflow.python.types import internal
 from tensorflow.python.util import lazy_loader
 from tensorflow.python.util import nest
 
@@ -61,22 +62,58 @@ parallel_ops = lazy_loader.LazyLoader(
 
 UNSPECIFIED = object()
 
+# The overloads below are called for every builtin call in converted code, so
+# they cache the classification of their arguments by type rather than repeating
+# the isinstance checks on each call. The size limit guards against unbounded
+# growth when many transient types are seen.
+# Note: the caches hold strong references to their key types and never evict
+# entries, so locally or dynamically defined classes stay alive once cached.
+_DISPATCH_CACHE_MAX_SIZE = 1000
+
+# Local aliases for the ops and dtypes used by the overloads below, to save
+# attribute lookups on each call.
+_abs = math_ops.abs
+_cast = math_ops.cast
+_maximum = math_ops.maximum
+_range = math_ops.range
+
+_DT_FLOAT32 = dtypes.float32
+_DT_INT32 = dtypes.int32
+_DT_STRING = dtypes.string
+
+# Caches whether a type is a native tensor type, keyed by value type. See
+# _is_tensor.
+_IS_TENSOR_TYPE = {}
+
+# Caches the overload of len_ to use, keyed by value type. See len_.
+_LEN_DISPATCH = {}
+
+# Caches the overload of enumerate_ to use, keyed by value type. This only
+# depends on isinstance checks, so unlike is_tensor it is a function of the
+# type alone.
+_ENUMERATE_DISPATCH = {}
+
 
 def overload_of(f):
-  if f in SUPPORTED_BUILTINS:
-    return BUILTIN_FUNCTIONS_MAP[f.__name__]
-  return f
+  """Returns the overload of `f` if it is a supported builtin, else `f`."""
+  try:
+    return _BUILTIN_OVERLOADS.get(f, f)
+  except TypeError:
+    # Unhashable callables cannot be builtins.
+    return f
 
 
 def _find_originating_frame(caller_fn_scope, innermost=True):
   """Locates the frame in which `caller_fn_scope` was defined."""
-  ctx_frame = inspect.currentframe()
+  # Start from the caller; this function's own frame is never a match.
+  ctx_frame = sys._getframe(1)  # pylint:disable=protected-access
+  scope_name = caller_fn_scope.name
   result = None
   while ctx_frame is not None:
     # Note it should not be normally possible to get false positives this way
     # because the function scope object is not accessible to user code (barring
     # call stack introspection).
-    if ctx_frame.f_locals.get(caller_fn_scope.name, None) is caller_fn_scope:
+    if ctx_frame.f_locals.get(scope_name) is caller_fn_scope:
       result = ctx_frame
       if innermost:
         break
@@ -131,10 +168,6 @@ def super_in_original_context(f, args, caller_fn_scope):
       `caller_fn_scope`.
   """
 
-  # Python 2 doesn't support implicit argument super variants.
-  if six.PY2:
-    return f(*args)
-
   # Only the no-arg call is desugared.
   if args:
     return f(*args)
@@ -176,8 +209,21 @@ def super_in_original_context(f, args, caller_fn_scope):
   return f(type_arg, self_arg)
 
 
+def _is_tensor(x):
+  """Equivalent to tensor_util.is_tensor, with the type checks cached."""
+  x_type = type(x)
+  is_tensor_type = _IS_TENSOR_TYPE.get(x_type)
+  if is_tensor_type is None:
+    is_tensor_type = issubclass(x_type, (internal.NativeObject, core.Tensor))
+    if len(_IS_TENSOR_TYPE) < _DISPATCH_CACHE_MAX_SIZE:
+      _IS_TENSOR_TYPE[x_type] = is_tensor_type
+  # is_tensor_like is a duck-typed property of the instance, so it can't be
+  # cached by type.
+  return is_tensor_type or bool(getattr(x, 'is_tensor_like', False))
+
+
 def abs_(x):
-  if tensor_util.is_tensor(x):
+  if _is_tensor(x):
     return _tf_abs(x)
   if isinstance(x, dataset_ops.DatasetV2):
     return _tf_dataset_abs(x)
@@ -185,7 +231,7 @@ def abs_(x):
 
 
 def _tf_abs(x):
-  return math_ops.abs(x)
+  return _abs(x)
 
 
 def _tf_dataset_abs(x):
@@ -202,16 +248,16 @@ def _py_abs(x):
 
 
 def float_(x=0):
-  if tensor_util.is_tensor(x):
+  if _is_tensor(x):
     return _tf_float(x)
   return _py_float(x)
 
 
 def _tf_float(x):
   # TODO(mdan): We shouldn't assume float32.
-  if x.dtype == dtypes.string:
-    return gen_parsing_ops.string_to_number(x, out_type=dtypes.float32)
-  return math_ops.cast(x, dtype=dtypes.float32)
+  if x.dtype == _DT_STRING:
+    return gen_parsing_ops.string_to_number(x, out_type=_DT_FLOAT32)
+  return _cast(x, dtype=_DT_FLOAT32)
 
 
 def _py_float(x):
@@ -219,7 +265,7 @@ def _py_float(x):
 
 
 def int_(x=0, base=UNSPECIFIED):
-  if tensor_util.is_tensor(x):
+  if _is_tensor(x):
     return _tf_int(x, base)
   return _py_int(x, base)
 
@@ -229,9 +275,9 @@ def _tf_int(x, base):
     raise NotImplementedError('base {} not supported for int'.format(base))
 
   # TODO(mdan): We shouldn't assume int32.
-  if x.dtype == dtypes.string:
-    return gen_parsing_ops.string_to_number(x, out_type=dtypes.int32)
-  return math_ops.cast(x, dtype=dtypes.int32)
+  if x.dtype == _DT_STRING:
+    return gen_parsing_ops.string_to_number(x, out_type=_DT_INT32)
+  return _cast(x, dtype=_DT_INT32)
 
 
 def _py_int(x, base):
@@ -241,15 +287,35 @@ def _py_int(x, base):
 
 
 def len_(s):
+  key = type(s)
+  if _is_tensor(s):
+    if not _IS_TENSOR_TYPE.get(key):
+      # Tensor only through its is_tensor_like attribute, which may differ
+      # between instances of the same type. See _is_tensor.
+      return _len_fn_for(s)(s)
+    if s.dtype == dtypes.variant:
+      # Variant tensors may or may not be tensor lists, depending on their
+      # rank.
+      key = (key, bool(s.shape.ndims))
+  len_fn = _LEN_DISPATCH.get(key)
+  if len_fn is None:
+    len_fn = _len_fn_for(s)
+    if len(_LEN_DISPATCH) < _DISPATCH_CACHE_MAX_SIZE:
+      _LEN_DISPATCH[key] = len_fn
+  return len_fn(s)
+
+
+def _len_fn_for(s):
+  """Returns the overload of len_ that applies to `s`."""
   if tensors.is_tensor_array(s):
-    return _tf_tensor_array_len(s)
+    return _tf_tensor_array_len
   elif tensors.is_tensor_list(s):
-    return _tf_tensor_list_len(s)
-  elif tensor_util.is_tensor(s):
-    return _tf_tensor_len(s)
+    return _tf_tensor_list_len
+  elif _is_tensor(s):
+    return _tf_tensor_len
   if isinstance(s, dataset_ops.DatasetV2):
-    return _tf_dataset_len(s)
-  return _py_len(s)
+    return _tf_dataset_len
+  return _py_len
 
 
 def _tf_tensor_array_len(s):
@@ -262,35 +328,32 @@ def _tf_tensor_list_len(s):
 
 def _tf_tensor_len(s):
   """Overload of len_ for Tensor arguments."""
-  # Statically shaped tensors: length is known ahead of time.
-  if s.shape.ndims and s.shape.dims[0].value is not None:
-    return s.shape.dims[0].value
+  shape = s.shape
 
-  # Static shape of unknown dimensions: use dynamic shape but statically
-  # check that it's a scalar.
-  shape = array_ops.shape(s)
+  if shape.ndims is not None:
+    if shape.ndims == 0:
+      raise ValueError(
+          'len requires a non-scalar tensor, got one of shape {}'.format(shape))
 
-  assert shape.shape, 'shape tensor of zero size? {}'.format(shape)
+    # Statically shaped tensors: length is known ahead of time.
+    if shape.dims[0].value is not None:
+      return shape.dims[0].value
 
-  if shape.shape[0] == 0:
-    raise ValueError(
-        'len requires a non-scalar tensor, got one of shape {}'.format(shape))
-
-  if shape.shape.dims[0].value is not None:
+    # Static rank but unknown first dimension: use dynamic shape.
     return array_ops.shape(s)[0]
 
   # Fully dynamic shape: use ops.
   rank = array_ops.rank(s)
+  return control_flow_ops.cond(rank > 0, lambda: array_ops.shape(s)[0],
+                               lambda: _raise_zero_rank_error(rank))
 
-  def raise_zero_rank_error():
-    msg = gen_string_ops.string_join(
-        ['len requires non-zero rank, got ',
-         gen_string_ops.as_string(rank)])
-    with ops.control_dependencies([control_flow_ops.Assert(False, [msg])]):
-      return constant_op.constant(0, dtype=dtypes.int32)
 
-  return control_flow_ops.cond(rank > 0, lambda: array_ops.shape(s)[0],
-                               raise_zero_rank_error)
+def _raise_zero_rank_error(rank):
+  msg = gen_string_ops.string_join(
+      ['len requires non-zero rank, got ',
+       gen_string_ops.as_string(rank)])
+  with ops.control_dependencies([control_flow_ops.Assert(False, [msg])]):
+    return constant_op.constant(0, dtype=dtypes.int32)
 
 
 def _tf_dataset_len(s):
@@ -317,18 +380,23 @@ def _py_len(s):
   return len(s)
 
 
+_VALID_PRINT_KWARGS = frozenset(('sep', 'end', 'file', 'flush'))
+
+
 def print_(*objects, **kwargs):
   """Overload of the print builtin."""
-  # Note: Python 2.6 doesn't support explicit keywords after starargs.
-  unknown_kwargs = tuple(
-      set(kwargs.keys()) - set(('sep', 'end', 'file', 'flush')))
+  unknown_kwargs = kwargs.keys() - _VALID_PRINT_KWARGS
   if unknown_kwargs:
-    raise ValueError('invalid keyword arguments: {}'.format(unknown_kwargs))
+    raise ValueError(
+        'invalid keyword arguments: {}'.format(tuple(unknown_kwargs)))
 
   # TODO(mdan): Use next.flatten(objects) instead?
-  if any(tensor_util.is_tensor(o) for o in objects):
+  # Note: this must use the same predicate as py_func.wrap_py_func, so that the
+  # flags match the values that the py_func wrapper receives.
+  tensor_flags = tuple(map(tensor_util.is_tensor, objects))
+  if any(tensor_flags):
     # TODO(mdan): use tf.print instead.
-    return _tf_py_func_print(objects, kwargs)
+    return _tf_py_func_print(objects, tensor_flags, kwargs)
   else:
     _py_print(*objects, **kwargs)
 
@@ -337,30 +405,56 @@ def _py_print(*objects, **kwargs):
   print(*objects, **kwargs)
 
 
-def _tf_py_func_print(objects, kwargs):
-  """Overload of print_ as a py_func implementation."""
-  override_kwargs = {k: v for k, v in kwargs.items() if v is not UNSPECIFIED}
-  if 'flush' not in override_kwargs:
+def _tf_py_func_print(objects, tensor_flags, kwargs):
+  """Overload of print_ as a py_func implementation.
+
+  Args:
+    objects: Tuple[Any], the objects to print.
+    tensor_flags: Tuple[bool], whether each element of `objects` is a tensor.
+    kwargs: Dict[Text, Any], the keyword arguments of print_.
+
+  Returns:
+    The py_func op that prints `objects`.
+  """
+  # Note: kwargs is private to the print_ call, so it's safe to use it directly
+  # when it doesn't need filtering.
+  if any(v is UNSPECIFIED for v in kwargs.values()):
+    override_kwargs = {
+        k: v for k, v in kwargs.items() if v is not UNSPECIFIED}
+  else:
+    override_kwargs = kwargs
+  if override_kwargs.get('flush', UNSPECIFIED) is UNSPECIFIED:
     # Defaulting to flushing the console in graph mode, which helps reduce
     # garbled output in IPython.
-    override_kwargs['flush'] = True
+    override_kwargs = dict(override_kwargs, flush=True)
 
   def print_wrapper(*vals):
-    vals = tuple(v.numpy() if tensor_util.is_tensor(v) else v for v in vals)
-    if not six.PY2:
-      # TensorFlow doesn't seem to generate Unicode when passing strings to
-      # py_func. This causes the print to add a "b'" wrapper to the output,
-      # which is probably never what you want.
-      vals = tuple(
-          v.decode('utf-8') if isinstance(v, bytes) else v for v in vals)
-    six.print_(*vals, **override_kwargs)
+    vals = tuple(
+        _py_func_print_value(v, is_tensor)
+        for v, is_tensor in zip(vals, tensor_flags))
+    print(*vals, **override_kwargs)
 
   return py_func.wrap_py_func(
       print_wrapper, None, objects, use_dummy_return=True)
 
 
+def _py_func_print_value(v, is_tensor):
+  """Converts a value received by the print py_func to a printable one."""
+  if is_tensor:
+    v = v.numpy()
+  # TensorFlow doesn't seem to generate Unicode when passing strings to
+  # py_func. This causes the print to add a "b'" wrapper to the output,
+  # which is probably never what you want.
+  if isinstance(v, bytes):
+    return v.decode('utf-8')
+  return v
+
+
 def range_(start_or_stop, stop=UNSPECIFIED, step=UNSPECIFIED):
-  if any(tensor_util.is_tensor(s) for s in (start_or_stop, stop, step)):
+  # Note: UNSPECIFIED is never a tensor, so it doesn't need to be checked.
+  if (_is_tensor(start_or_stop) or
+      (stop is not UNSPECIFIED and _is_tensor(stop)) or
+      (step is not UNSPECIFIED and _is_tensor(step))):
     return _tf_range(start_or_stop, stop, step)
   return _py_range(start_or_stop, stop, step)
 
@@ -374,12 +468,36 @@ def _tf_range(start_or_stop, stop, step):
   # TODO(mdan): We should optimize this when a full tensor is not required.
   if step is not UNSPECIFIED:
     # TODO(mdan): Add argument coercion similar to other cases.
-    return math_ops.range(start_or_stop, stop, step)
+    return _range(start_or_stop, stop, step)
   if stop is not UNSPECIFIED:
-    stop = math_ops.maximum(start_or_stop, stop)
-    return math_ops.range(start_or_stop, stop)
-  start_or_stop = math_ops.maximum(start_or_stop, 0)
-  return math_ops.range(start_or_stop)
+    start_value = _static_value(start_or_stop)
+    stop_value = _static_value(stop)
+    if (start_value is not None and stop_value is not None and
+        stop_value >= start_value):
+      # Statically known not to need clamping.
+      return _range(start_or_stop, stop)
+    stop = _maximum(start_or_stop, stop)
+    return _range(start_or_stop, stop)
+  start_value = _static_value(start_or_stop)
+  if start_value is not None and start_value >= 0:
+    # Statically known not to need clamping.
+    return _range(start_or_stop)
+  start_or_stop = _maximum(start_or_stop, 0)
+  return _range(start_or_stop)
+
+
+def _static_value(x):
+  """Returns the scalar value of `x` if known statically, None otherwise."""
+  if isinstance(x, int):
+    return x
+  # Note: graph tensors are not folded with tensor_util.constant_value, because
+  # that makes them unfeedable and walks the producer graph on each call.
+  if not isinstance(x, ops.EagerTensor):
+    return None
+  value = x.numpy()
+  if np.ndim(value) != 0:
+    return None
+  return value
 
 
 def _py_range(start_or_stop, stop, step):
@@ -391,19 +509,35 @@ def _py_range(start_or_stop, stop, step):
 
 
 def enumerate_(s, start=0):
+  s_type = type(s)
+  enumerate_fn = _ENUMERATE_DISPATCH.get(s_type)
+  if enumerate_fn is None:
+    enumerate_fn = _enumerate_fn_for(s)
+    if len(_ENUMERATE_DISPATCH) < _DISPATCH_CACHE_MAX_SIZE:
+      _ENUMERATE_DISPATCH[s_type] = enumerate_fn
+  return enumerate_fn(s, start)
+
+
+def _enumerate_fn_for(s):
+  """Returns the overload of enumerate_ that applies to `s`."""
   if isinstance(s, dataset_ops.DatasetV2):
-    return _tf_dataset_enumerate(s, start)
+    return _tf_dataset_enumerate
   if isinstance(
       s, (input_lib.DistributedIterator, input_lib.DistributedDataset)):
-    raise NotImplementedError(
-        'use a for loop over the dataset and keep a separate counter')
-  return _py_enumerate(s, start)
+    return _tf_distributed_enumerate
+  return _py_enumerate
 
 
 def _tf_dataset_enumerate(s, start=0):
   return s.enumerate(start)
 
 
+def _tf_distributed_enumerate(s, start=0):
+  del s, start
+  raise NotImplementedError(
+      'use a for loop over the dataset and keep a separate counter')
+
+
 def _py_enumerate(s, start=0):
   return enumerate(s, start)
 
@@ -636,26 +770,30 @@ def _py_sorted(iterable, key, reverse):
   return sorted(iterable)
 
 
-SUPPORTED_BUILTINS = (abs, float, int, len, print, range, enumerate, zip, map,
-                      filter, any, all, sorted)
-
-if six.PY2:
-  SUPPORTED_BUILTINS += (xrange,)
-
-BUILTIN_FUNCTIONS_MAP = {
-    'abs': abs_,
-    'any': any_,
-    'all': all_,
-    'enumerate': enumerate_,
-    'filter': filter_,
-    'float': float_,
-    'int': int_,
-    'len': len_,
-    'map': map_,
-    'next': next_,
-    'print': print_,
-    'range': range_,
-    'sorted': sorted_,
-    'xrange': range_,
-    'zip': zip_,
-}
+# The builtin functions that overload_of replaces, with their overloads. This
+# is the single source for the lookup tables below.
+_BUILTIN_SPECS = (
+    (abs, abs_),
+    (all, all_),
+    (any, any_),
+    (enumerate, enumerate_),
+    (filter, filter_),
+    (float, float_),
+    (int, int_),
+    (len, len_),
+    (map, map_),
+    (print, print_),
+    (range, range_),
+    (sorted, sorted_),
+    (zip, zip_),
+)
+
+SUPPORTED_BUILTINS = frozenset(f for f, _ in _BUILTIN_SPECS)
+
+# Maps builtin function names to their overloads. Note that next_ is available
+# by name, but is not applied by overload_of.
+BUILTIN_FUNCTIONS_MAP = {f.__name__: overload for f, overload in _BUILTIN_SPECS}
+BUILTIN_FUNCTIONS_MAP['next'] = next_
+
+# Maps each supported builtin function object directly to its overload.
+_BUILTIN_OVERLOADS = dict(_BUILTIN_SPECS)
@@ -31,6 +31,7 @@ from tensorflow.python.eager import def_function
 from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import errors_impl
+from tensorflow.python.framework import ops
 from tensorflow.python.framework import test_util
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import math_ops
@@ -47,6 +48,25 @@ class TestBase(object):
 @test_util.run_all_in_graph_and_eager_modes
 class PyBuiltinsTest(test.TestCase):
 
+  def test_overload_of(self):
+    self.assertIs(py_builtins.overload_of(abs), py_builtins.abs_)
+    self.assertIs(py_builtins.overload_of(range), py_builtins.range_)
+
+    def test_fn():
+      pass
+
+    self.assertIs(py_builtins.overload_of(test_fn), test_fn)
+
+    class UnhashableCallable(object):
+
+      __hash__ = None
+
+      def __call__(self):
+        pass
+
+    unhashable = UnhashableCallable()
+    self.assertIs(py_builtins.overload_of(unhashable), unhashable)
+
   def test_abs(self):
     self.assertEqual(py_builtins.abs_(-1), 1)
     with self.cached_session() as sess:
@@ -124,6 +144,22 @@ class PyBuiltinsTest(test.TestCase):
       tl = py_builtins.len_(data_structures.tf_tensor_list_new([3, 4, 5]))
       self.assertEqual(self.evaluate(tl), 3)
 
+  def test_len_variant_tensors(self):
+    # Scalar variant tensors are tensor lists, while variant tensors of higher
+    # rank are not, even though both have the same Python type.
+    with self.cached_session() as sess:
+      l = data_structures.tf_tensor_list_new([3, 4, 5])
+      stacked = array_ops.stack(
+          [l, data_structures.tf_tensor_list_new([6])])
+      self.assertIs(type(l), type(stacked))
+
+      tl = py_builtins.len_(l)
+      self.assertEqual(self.evaluate(tl), 3)
+      t = py_builtins.len_(stacked)
+      self.assertEqual(t, 2)
+      tl = py_builtins.len_(data_structures.tf_tensor_list_new([6, 7]))
+      self.assertEqual(self.evaluate(tl), 2)
+
   def test_len_dataset(self):
     dataset = dataset_ops.DatasetV2.from_tensor_slices([3, 2, 1])
     self.assertEqual(self.evaluate(py_builtins.len_(dataset)), 3)
@@ -202,11 +238,55 @@ class PyBuiltinsTest(test.TestCase):
     finally:
       sys.stdout = sys.__stdout__
 
+  @test_util.run_deprecated_v1
+  def test_print_tensors_with_kwargs(self):
+    try:
+      out_capturer = six.StringIO()
+      sys.stdout = out_capturer
+      with self.cached_session() as sess:
+        sess.run(
+            py_builtins.print_(constant_op.constant('test message'), 1,
+                               sep='-'))
+        self.assertEqual(out_capturer.getvalue(), 'test message-1\n')
+    finally:
+      sys.stdout = sys.__stdout__
+
+  @test_util.run_deprecated_v1
+  def test_print_tensors_flush_defaults_to_true(self):
+
+    class FlushRecorder(six.StringIO):
+
+      flushed = False
+
+      def flush(self):
+        self.flushed = True
+
+    out_capturer = FlushRecorder()
+    with self.cached_session() as sess:
+      sess.run(
+          py_builtins.print_(
+              constant_op.constant('test message'),
+              file=out_capturer,
+              flush=py_builtins.UNSPECIFIED))
+      self.assertEqual(out_capturer.getvalue(), 'test message\n')
+      self.assertTrue(out_capturer.flushed)
+
+  def test_print_invalid_kwargs(self):
+    with self.assertRaises(ValueError):
+      py_builtins.print_(constant_op.constant('test message'), bogus=1)
+
   def test_range(self):
     self.assertListEqual(list(py_builtins.range_(3)), [0, 1, 2])
     self.assertListEqual(list(py_builtins.range_(1, 3)), [1, 2])
     self.assertListEqual(list(py_builtins.range_(2, 0, -1)), [2, 1])
 
+  def test_range_static_does_not_create_ops(self):
+    with ops.Graph().as_default() as g:
+      self.assertIsInstance(py_builtins.range_(3), range)
+      self.assertIsInstance(py_builtins.range_(1, 3), range)
+      self.assertIsInstance(py_builtins.range_(2, 0, -1), range)
+      self.assertEmpty(g.get_operations())
+
   def test_range_tensor(self):
     with self.cached_session() as sess:
       r = py_builtins.range_(constant_op.constant(3))
@@ -223,6 +303,24 @@ class PyBuiltinsTest(test.TestCase):
       r = py_builtins.range_(5, constant_op.constant(2))
       self.assertAllEqual(self.evaluate(r), [])
 
+  @test_util.run_deprecated_v1
+  def test_range_tensor_constant_bound_feedable(self):
+    with self.cached_session() as sess:
+      n = constant_op.constant(3)
+      r = py_builtins.range_(n)
+      self.assertAllEqual(sess.run(r, {n: 5}), [0, 1, 2, 3, 4])
+
+  def test_range_mixed_bounds(self):
+    with self.cached_session() as sess:
+      r = py_builtins.range_(1, constant_op.constant(3))
+      self.assertAllEqual(self.evaluate(r), [1, 2])
+      r = py_builtins.range_(constant_op.constant(1), 3)
+      self.assertAllEqual(self.evaluate(r), [1, 2])
+      r = py_builtins.range_(5, constant_op.constant(2))
+      self.assertAllEqual(self.evaluate(r), [])
+      r = py_builtins.range_(constant_op.constant(5), 2)
+      self.assertAllEqual(self.evaluate(r), [])
+
   def test_enumerate(self):
     self.assertListEqual(
         list(py_builtins.enumerate_([3, 2, 1])), [(0, 3), (1, 2), (2, 1)])